@@ -1,33 +1,70 @@
-from pprint import pprint
 import requests
 from requests import Response
-from math import ceil
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
-from urllib.parse import urlparse, urljoin
-from typing import Union, List
-from pyrate_limiter import RequestRate, Duration, MemoryListBucket, Limiter
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from inspect import signature
+from typing import Union, List, Iterator
+try:  # faster json parsing if available
+    import orjson
+except ImportError:
+    orjson = None
+try:  # streaming json parsing if available, see ClickupClient.get_tasks_100
+    import ijson
+except ImportError:
+    ijson = None
+try:  # dependencies of AsyncClickupClient are optional
+    import aiohttp
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    aiohttp = None
 
+logger = logging.getLogger(__name__)
 token = os.environ.get("ClickUpToken")
 RESOURCE_URI = "https://api.clickup.com/api/v2"
 RATE_LIMIT = 100
+TASKS_PER_PAGE = 100  # page size of 'Get Filtered Team Tasks' endpoint
+MAX_WORKERS = 10  # number of concurrent requests issued by a single client
+POOL_SIZE = 20  # number of keep-alive connections kept by the session
+RETRY_ATTEMPTS = 5  # retries of a single request on 429 and 5xx responses
+RETRY_TOKENS_CAP = 10.0  # size of the client-side retry budget
+RETRY_TOKENS_REFILL = 0.1  # share of a retry earned back by every successful request
+ASYNC_CONCURRENCY = 20  # number of in-flight requests issued by AsyncClickupClient
+ASYNC_CONNECTIONS = 50  # size of the AsyncClickupClient connection pool
 
 
 class ClickupClient():
     """
     Basic class to call the Clickup API
     """
-    task_bool_opt = ["reverse", "subtasks", "include_closed"]
-    task_list_opt = [
+    __slots__ = (
+        "token",
+        "session",
+        "_base",
+        "_spaces_cache",
+        "_lists_cache",
+        "_tokens",
+        "_reset_ts",
+        "_rate_cond",
+        "_retry_tokens",
+        "_retry_lock",
+    )
+    task_bool_opt = frozenset({"reverse", "subtasks", "include_closed"})
+    task_list_opt = frozenset({
         "space_ids",
         "project_ids",
         "list_ids",
         "statuses",
         "assignees",
         "tags",
-    ]
-    limit_rate = RequestRate(RATE_LIMIT, Duration.MINUTE)
-    limiter = Limiter(limit_rate)
-    item = 'clickup'
+    })
 
     def __init__(self, token):
         """Inits the basic ClickupCLient instance
@@ -35,37 +72,176 @@ class ClickupClient():
             token (str): personal token, https://clickup.com/api for more info. OAuth2 flow is not implemented here
         """
         self.token = token
+        self._base = f"{RESOURCE_URI.rstrip('/')}/"
+        # name -> object indexes filled on the first lookup by name
+        self._spaces_cache = {}
+        self._lists_cache = {}
         self.session = requests.Session()
+        # requests already advertises gzip and deflate (and br if brotli is installed)
+        # and keeps connections alive, only the token has to be added
         self.session.headers.update(
             {"Authorization": self.token}
         )
+        # rate limit state shared by all threads, updated from the response headers, see _send
+        self._tokens = RATE_LIMIT
+        self._reset_ts = 0.0
+        self._rate_cond = threading.Condition()
+        # retry budget shared by all threads, see _get_response
+        self._retry_tokens = RETRY_TOKENS_CAP
+        self._retry_lock = threading.Lock()
+        # pool is larger than the number of worker threads so that connections are reused,
+        # connection errors are retried with exponential backoff.
+        # Responses are never retried here (not even the ones with Retry-After),
+        # 429 and 5xx responses are retried by _get_response
+        retry = Retry(
+            total=5,
+            status=0,
+            backoff_factor=0.5,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE,
+                              max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    @limiter.ratelimit(item, delay=True)
-    def _get_wrapper(self, url: str) -> Response:
+    def _get_wrapper(self, url: str, params: list = None) -> dict:
         """Wrapper for GET calls controlling for API rate limiting
         Args:
             url (str): url used for GET call
+            params (list, optional): query parameters as (key, value) pairs. Defaults to None.
         Raises:
             ValueError: raised if no response or error response are received
         Returns:
-            Response: response recieved from the server
+            dict: json response recieved from the server
         """
-        resp = self.session.get(url)
-        if resp.status_code != 200:
-            raise ValueError(f"Какие-то беды. Код ошибки: {resp.status_code}")
+        return self._decode(self._get_response(url, params))
+
+    @staticmethod
+    def _decode(resp: Response) -> dict:
+        """Parse the json body of the response, with orjson if it is installed"""
+        if orjson is not None:
+            return orjson.loads(resp.content)
         return resp.json()
 
+    def _get_response(self, url: str, params: list = None, stream: bool = False) -> Response:
+        """Rate limited GET call returning a successful response.
+        429 and 5xx responses are retried while the client-side retry budget lasts:
+        every retry spends a token, every successful response earns back a fraction of one,
+        so a struggling server is not flooded with retries.
+        Args:
+            url (str): url used for GET call
+            params (list, optional): query parameters as (key, value) pairs. Defaults to None.
+            stream (bool, optional): whether to leave the response body unread. Defaults to False.
+        Raises:
+            ValueError: raised if no response or error response are received
+        Returns:
+            Response: response recieved from the server
+        """
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            resp = self._send(url, params, stream)
+            if resp.status_code == 200:
+                with self._retry_lock:
+                    self._retry_tokens = min(
+                        RETRY_TOKENS_CAP, self._retry_tokens + RETRY_TOKENS_REFILL)
+                return resp
+            resp.close()
+            if resp.status_code != 429 and resp.status_code < 500:
+                break
+            if attempt == RETRY_ATTEMPTS:
+                break
+            with self._retry_lock:
+                if self._retry_tokens < 1:
+                    break  # retry budget is exhausted, fail fast
+                self._retry_tokens -= 1
+            time.sleep(self._retry_delay(resp, attempt))
+        raise ValueError(f"Какие-то беды. Код ошибки: {resp.status_code}")
+
+    def _send(self, url: str, params: list = None, stream: bool = False) -> Response:
+        """Rate limited GET call. The number of requests left and the time the limit resets
+        are taken from X-RateLimit-Remaining and X-RateLimit-Reset headers of every response,
+        once no requests are left the call sleeps until the reset.
+        Args:
+            url (str): url used for GET call
+            params (list, optional): query parameters as (key, value) pairs. Defaults to None.
+            stream (bool, optional): whether to leave the response body unread. Defaults to False.
+        Returns:
+            Response: response recieved from the server
+        """
+        with self._rate_cond:
+            while True:
+                if self._tokens <= 0 and self._reset_ts <= time.time():
+                    self._tokens = RATE_LIMIT  # the limit has been reset
+                if self._tokens > 0:
+                    self._tokens -= 1
+                    break
+                # waiting releases the lock so that other threads can record fresher headers,
+                # the state is checked again once they do or the reset time comes
+                self._rate_cond.wait(self._reset_ts - time.time())
+        logger.debug("GET %s params=%s", url, params)
+        resp = self.session.get(url, params=params, stream=stream)
+        remaining = self._header_number(resp, "X-RateLimit-Remaining")
+        reset = self._header_number(resp, "X-RateLimit-Reset")
+        with self._rate_cond:
+            if reset is not None and reset > self._reset_ts:
+                # a new rate limit window has started
+                self._reset_ts = reset
+                if remaining is not None:
+                    self._tokens = int(remaining)
+            elif reset is None or reset == self._reset_ts:
+                # responses of concurrent requests may arrive out of order,
+                # the lowest count seen within a window is the freshest one
+                if remaining is not None:
+                    self._tokens = min(self._tokens, int(remaining))
+                if reset is None and self._reset_ts <= time.time():
+                    self._reset_ts = time.time() + 60
+            # otherwise the response belongs to a previous window and is ignored
+            self._rate_cond.notify_all()
+        return resp
+
+    @staticmethod
+    def _header_number(resp: Response, name: str) -> float:
+        """Numeric value of the resp header called name, None if it is missing or malformed"""
+        value = resp.headers.get(name)
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning("Malformed %s header: %r", name, value)
+            return None
+
+    @staticmethod
+    def _retry_delay(resp: Response, attempt: int) -> float:
+        """Seconds to wait before retrying the request which produced the resp response.
+        Retry-After header is used if present (either seconds or HTTP date),
+        exponential backoff otherwise. Some jitter is added to spread out concurrent retries.
+        """
+        delay = 2 ** attempt
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    pass
+        return max(0, delay) + random.uniform(0, 1)
+
     def _construct_endpoint(self, endpoint: str) -> str:
         """Convert a relative path such as /user to a full URI based
-        on the current RESOURCE setting.
+        on the current RESOURCE setting. Built-in methods format their URLs
+        from self._base directly, this is kept for arbitrary user supplied endpoints.
         Args:
             endpoint (str): endpoint to use for constructing a URL
         Returns:
             str: full URI, i.e. "https://api.clickup.com/api/v2/user"
         """
-        if urlparse(endpoint).scheme in ["http", "https"]:
+        if endpoint.startswith(("http://", "https://")):
             return endpoint  # url is already complete
-        return urljoin(f"{RESOURCE_URI}/", endpoint.lstrip("/"))
+        return self._base + endpoint.lstrip("/")
 
     def get_user(self) -> dict:
         """Get the user on whose behalf API calls are made
@@ -73,7 +249,7 @@ class ClickupClient():
             dict: user id, username and some other fields. For more details
             refer to 'Get Authorized user' section on https://clickup.com/api
         """
-        url = self._construct_endpoint("/user")
+        url = f"{self._base}user"
         return self._get_wrapper(url)['user']
 
     def get_teams(self, id_only: bool = False) -> Union[str, List[dict]]:
@@ -87,7 +263,7 @@ class ClickupClient():
             List of all dicts containing info on all teams available to the user otherwise.
             For more details refer to 'Get Authorized Teams' section on https://clickup.com/api
         """
-        url = self._construct_endpoint("/team")
+        url = f"{self._base}team"
         res = self._get_wrapper(url)
         if id_only:
             return res['teams'][0]['id']
@@ -104,14 +280,14 @@ class ClickupClient():
             list: list of dicts containing info on all spaces in the specified team.
             For more details refer to 'Get Spaces' section on https://clickup.com/api
         """
-        url = self._construct_endpoint(
-            f"/team/{team_id}/space?{str(archived).lower()}")
+        url = f"{self._base}team/{team_id}/space?{str(archived).lower()}"
         res = self._get_wrapper(url)
         return res['spaces']
 
     def get_space_by_name(self, team_id: str, name: str,
                           archived: bool = False) -> dict:
-        """Fetch the space with a name specified in the 'name' argument
+        """Fetch the space with a name specified in the 'name' argument.
+        Spaces of a team are requested once and cached on the instance.
         Args:
             team_id (str): id of the team we want to retrieve spaces for
             archived (bool, optional): whether to include archived workspaces in the results.
@@ -123,13 +299,11 @@ class ClickupClient():
             dict: contains various space attributes. For a complete list
             refer to 'Get Spaces' section on https://clickup.com/api
         """
-        spaces = self.get_spaces(team_id, archived)
-        for space in spaces:
-            if space['name'] == name:
-                return space
-        else:
-            raise ValueError(
-                "К сожалению, спейса с таким именем не нашлось")
+        key = (team_id, archived)
+        if key not in self._spaces_cache:
+            self._spaces_cache[key] = self._name_index(self.get_spaces(team_id, archived))
+        return self._find_by_name(
+            self._spaces_cache[key], name, "К сожалению, спейса с таким именем не нашлось")
 
     def get_lists(self, space_id: str, archived: bool = False) -> list:
         """Get the list of lists contained in the workspace specified in the space_id argument
@@ -140,8 +314,7 @@ class ClickupClient():
             list: collection of dicts with info on all lists in the specified space.
             For more details refer to 'Get Folderless Lists' section on https://clickup.com/api
         """
-        url = self._construct_endpoint(
-            f"/space/{space_id}/list?{str(archived).lower()}")
+        url = f"{self._base}space/{space_id}/list?{str(archived).lower()}"
         res = self._get_wrapper(url)
         return res['lists']
 
@@ -150,7 +323,8 @@ class ClickupClient():
             space_id: str,
             archived: bool = False,
             name: str = None) -> dict:
-        """Fetch the list with name specified in the 'name' argument
+        """Fetch the list with name specified in the 'name' argument.
+        Lists of a space are requested once and cached on the instance.
         Args:
             space_id (str): id of the space we want to retrieve lists for
             archived (bool, optional): whether to include archived lists in the results. Defaults to False.
@@ -162,13 +336,11 @@ class ClickupClient():
             dict: info on the specified list.
             For more details refer to 'Get List' section on https://clickup.com/api
         """
-        lists = self.get_lists(space_id, archived)
-        for lst in lists:
-            if lst['name'] == name:
-                return lst
-        else:
-            raise ValueError(
-                "К сожалению, листа с таким именем не нашлось")
+        key = (space_id, archived)
+        if key not in self._lists_cache:
+            self._lists_cache[key] = self._name_index(self.get_lists(space_id, archived))
+        return self._find_by_name(
+            self._lists_cache[key], name, "К сожалению, листа с таким именем не нашлось")
 
     def get_tasks_100(self,
                       team_id: str,
@@ -189,54 +361,74 @@ class ClickupClient():
                       date_created_lt: int = None,  # posix time
                       date_updated_gt: int = None,  # posix time
                       date_updated_lt: int = None,
-                      ) -> dict:
+                      fields: set = None,
+                      ) -> Union[dict, "TaskStream"]:
         """
         Gets the tasks contained in the team specified in the team_id argument.
         For a complete description of the arguments please refer to 'Get Filtered Team Tasks'
         section on https://clickup.com/api
+        Args:
+            fields (set, optional): task attributes to keep, e.g. {'id', 'status'}.
+            If set, the response is parsed incrementally (with ijson if installed)
+            and only these attributes of each task are kept. Defaults to None.
         Returns:
             dict: complete json response containing 100 or less tasks with all their attributes.
             For a full list and more details please refer to 'Get Filtered Team Tasks' section
             on https://clickup.com/api
+            TaskStream: iterator over the tasks containing only the attributes listed in fields,
+            if fields is set. It has to be consumed or closed to release the connection
         """
         # dropping arguments which are not query keywords
-        args = self._arg_filter(locals(), opt_exclude=['team_id'])
-        for i in self.task_bool_opt:
-            if i in args:
-                args[i] = str(args[i]).lower()
-        # constructing a query string
-        query_list=[]
-        for i in args:
-            if i in self.task_list_opt:
-                query_list.append('&'.join([ str(i)+'[]=' + str(k) for k in args[i]]))
-            else:
-                query_list.append(str(i) + '=' + str(args[i]))
-        # query_list = [
-        #     f"{''.join([str(i) if i not in self.task_list_opt])}"
-        #     f"={'&'.join([ str(i)+'[]=' + str(k) for k in args[i]]) if i in self.task_list_opt else args[i]}"
-        #     for i in args]
-        query_string = "&".join(query_list)
-        print(query_string)
+        args = self._arg_filter(locals(), opt_exclude=['team_id', 'fields'])
+        params = self._task_params(args)
         # calling the API
-        url = self._construct_endpoint(f"/team/{team_id}/task?{query_string}")
-        return self._get_wrapper(url)
+        url = f"{self._base}team/{team_id}/task"
+        if fields is None:
+            return self._get_wrapper(url, params)
+        resp = self._get_response(url, params, stream=True)
+        return TaskStream(resp, fields)
 
     def get_all_tasks(self, page_limit=-1, **kwargs) -> List[dict]:
         """get all tasks contained in the specified team.
         Accepts the same arguments as get_tasks_100.
+        The first page is requested alone, then pages are requested concurrently
+        in batches doubling in size until the last page is met.
         Args:
             page_limit (int, optional): Number of pages (of size 100 tasks) to retrieve. Defaults to -1.
         Returns:
             list: list of json responses from the server. for more details re content of each response
             please refer to 'Get Filtered Team Tasks' section on https://clickup.com/api
         """
-        page_num = 0
+        # query parameters are the same for every page except the page number
+        params = self._task_query_params(**kwargs)
+        url = f"{self._base}team/{kwargs['team_id']}/task"
         tasks = []
-        chunk = self.get_tasks_100(page=page_num, **kwargs)
-        while chunk['tasks'] and (page_limit < 0 or page_num < page_limit):
-            page_num += 1
-            tasks.append(chunk)
-            chunk = self.get_tasks_100(page=page_num, **kwargs)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for pages in self._page_batches(page_limit):
+                futures = [executor.submit(self._get_wrapper, url, params + [("page", page)])
+                           for page in pages]
+
+                def cancel_on_failure(done):
+                    # pages start in order, so the ones before the failed page are not cancelled
+                    if not done.cancelled() and done.exception() is not None:
+                        for pending in futures:
+                            pending.cancel()
+
+                for future in futures:
+                    future.add_done_callback(cancel_on_failure)
+                last_page_found = False
+                try:
+                    for future in futures:
+                        if self._add_page(tasks, future.result()):
+                            last_page_found = True
+                            break
+                finally:
+                    # once the last page is found or a request failed
+                    # the pages which are not requested yet are not needed
+                    for pending in futures:
+                        pending.cancel()
+                if last_page_found:
+                    break
         return tasks
 
     def get_task(self, task_id:str) -> dict:
@@ -247,7 +439,7 @@ class ClickupClient():
             dict: all the attributes of a task.
             For more details refer to 'Get Task' section on https://clickup.com/api
         """
-        url = self._construct_endpoint(f"/task/{task_id}")
+        url = f"{self._base}task/{task_id}"
         return self._get_wrapper(url)
 
     def get_custom_fields(self, list_id: str) -> dict:
@@ -258,7 +450,7 @@ class ClickupClient():
             dict: contains all the info related to custom fields defined in the list.
             For more details refer to 'Get Custom Fields' section on https://clickup.com/api
         """
-        url = self._construct_endpoint(f"/list/{list_id}/field")
+        url = f"{self._base}list/{list_id}/field"
         return self._get_wrapper(url)
 
     def get_time_in_status(self, task_ids: List[str]) -> dict:  #похоже, что по 100 отдает
@@ -269,14 +461,9 @@ class ClickupClient():
             dict: contains the info on status changes related to a tasks whose ids serve as dict keys.
             For more details refer to 'Get Bulk Tasks' Time in Status' section on https://clickup.com/api
         """
-        chunks = self._chunkifier(task_ids, 100)
-        res=[]
-        for chunk in chunks:
-            query_list = ["task_ids=" + task_id for task_id in chunk]
-            query = "&".join(query_list)
-            url = self._construct_endpoint(
-                f"task/bulk_time_in_status/task_ids/?{query}")
-            res.append(self._get_wrapper(url))
+        urls = self._time_in_status_urls(self._base, task_ids)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            res = list(executor.map(self._get_wrapper, urls))
         return res
 
     def get_tags(self, space_id: str) -> dict:
@@ -289,7 +476,7 @@ class ClickupClient():
             dict: contains the info on tag name and associated colors.
             For more details refer to 'Tags' section on https://clickup.com/api
         """
-        url = self._construct_endpoint(f"/space/{space_id}/tag")
+        url = f"{self._base}space/{space_id}/tag"
         return self._get_wrapper(url)
 
     @staticmethod
@@ -304,6 +491,365 @@ class ClickupClient():
                          if i not in excluder and locals[i] is not None}
         return filtered_args
 
+    @classmethod
+    def _task_params(cls, args: dict) -> list:
+        """
+            Converts get_tasks_100 arguments to query parameters,
+            list arguments are passed as key[]=value pairs
+        """
+        params = []
+        for key, value in args.items():
+            if key in cls.task_list_opt:
+                params.extend((f"{key}[]", item) for item in value)
+            elif key in cls.task_bool_opt:
+                params.append((key, str(value).lower()))
+            else:
+                params.append((key, value))
+        return params
+
+    @classmethod
+    def _task_query_params(cls, **kwargs) -> list:
+        """
+            Converts get_tasks_100 keyword arguments except page to query parameters
+            omitting team_id, so that they can be built once and reused for every page
+        """
+        if 'page' in kwargs:
+            raise TypeError("get_all_tasks() got an unexpected keyword argument 'page'")
+        bound = signature(cls.get_tasks_100).bind(None, **kwargs)
+        bound.apply_defaults()
+        if bound.arguments['fields'] is not None:
+            raise TypeError("get_all_tasks() does not support the fields argument, "
+                            "use ClickupClient.get_tasks_100 page by page instead")
+        args = cls._arg_filter(bound.arguments, opt_exclude=['team_id', 'page', 'fields'])
+        return cls._task_params(args)
+
+    @staticmethod
+    def _page_batches(page_limit: int) -> Iterator[range]:
+        """
+            Yields ranges of page numbers to be requested concurrently: the first page alone,
+            then batches doubling in size up to RATE_LIMIT pages, no further than page_limit if set
+        """
+        page_num = 0
+        batch_size = 1
+        while page_limit < 0 or page_num < page_limit:
+            batch_end = page_num + batch_size
+            if page_limit >= 0:
+                batch_end = min(batch_end, page_limit)
+            yield range(page_num, batch_end)
+            page_num = batch_end
+            batch_size = min(batch_size * 2, RATE_LIMIT)
+
+    @staticmethod
+    def _add_page(tasks: list, chunk: dict) -> bool:
+        """
+            Appends the page to tasks unless it is empty, returns True if it is the last page.
+            The last_page flag of the response is used if present, otherwise
+            a page with less than TASKS_PER_PAGE tasks is considered the last one
+        """
+        if not chunk['tasks']:
+            return True
+        tasks.append(chunk)
+        last_page = chunk.get('last_page')
+        if last_page is None:
+            return len(chunk['tasks']) < TASKS_PER_PAGE
+        return bool(last_page)
+
+    @staticmethod
+    def _time_in_status_urls(base: str, task_ids: List[str]) -> Iterator[str]:
+        """
+            Lazily yields 'Get Bulk Tasks' Time in Status' urls for chunks of 100 task_ids
+        """
+        return (f"{base}task/bulk_time_in_status/task_ids/?"
+                + "&".join("task_ids=" + task_id for task_id in chunk)
+                for chunk in ClickupClient._chunkifier(task_ids, 100))
+
+    @staticmethod
+    def _name_index(objects: List[dict]) -> dict:
+        """
+            Returns a {name: object} dict, the first object wins if names are duplicated
+        """
+        return {obj['name']: obj for obj in reversed(objects)}
+
+    @staticmethod
+    def _find_by_name(index: dict, name: str, message: str) -> dict:
+        """
+            Returns the object called name from the index, raises ValueError with message otherwise
+        """
+        found = index.get(name)
+        if found is None:
+            raise ValueError(message)
+        return found
+
     @staticmethod
     def _chunkifier(list_to_split, n):
-        return [list_to_split[i:i+n] for i in range(0, len(list_to_split), n)]
+        """
+            Lazily yields consecutive slices of list_to_split of size n or less
+        """
+        return (list_to_split[i:i+n] for i in range(0, len(list_to_split), n))
+
+
+class TaskStream():
+    """
+    Iterator over the tasks of a streamed get_tasks_100 response, keeping only
+    the attributes listed in fields. The response holds a pooled connection until
+    the stream is exhausted or closed, so consume it fully or use it as a context manager:
+
+        with client.get_tasks_100(team_id, fields={'id', 'status'}) as tasks:
+            ids = [task['id'] for task in tasks]
+    """
+
+    def __init__(self, resp: Response, fields: set):
+        """Inits the TaskStream instance
+        Args:
+            resp (Response): successful streamed response of 'Get Filtered Team Tasks' call
+            fields (set): task attributes to keep
+        """
+        self._resp = resp
+        self._tasks = self._project(resp, fields)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> dict:
+        try:
+            return next(self._tasks)
+        except BaseException:  # exhausted or failed to parse
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the connection held by the response"""
+        self._tasks.close()
+        self._resp.close()
+
+    @staticmethod
+    def _project(resp: Response, fields: set) -> Iterator[dict]:
+        """
+            Lazily yields the tasks of the response keeping only the attributes listed in fields.
+            Parses the body incrementally with ijson if it is installed
+        """
+        if ijson is not None:
+            resp.raw.decode_content = True
+            tasks = ijson.items(resp.raw, 'tasks.item', use_float=True)
+        else:
+            tasks = ClickupClient._decode(resp)['tasks']
+        for task in tasks:
+            yield {key: task[key] for key in fields if key in task}
+
+
+class AsyncClickupClient():
+    """
+    asyncio counterpart of ClickupClient built on aiohttp.
+    Requires aiohttp and aiolimiter to be installed. Exposes the public methods
+    of ClickupClient as coroutines, with the following differences:
+    - rate limiting is done by aiolimiter (RATE_LIMIT requests per minute)
+    instead of X-RateLimit-* response headers
+    - get_tasks_100 has no fields argument, the response is always parsed as a whole
+    Use it as an async context manager or call close() when done:
+
+        async with AsyncClickupClient(token) as client:
+            tasks = await client.get_all_tasks(team_id=team_id)
+    """
+
+    def __init__(self, token):
+        """Inits the AsyncClickupClient instance. The HTTP session is opened on the first request
+        Args:
+            token (str): personal token, https://clickup.com/api for more info. OAuth2 flow is not implemented here
+        Raises:
+            ImportError: raised if aiohttp or aiolimiter is not installed
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncClickupClient requires aiohttp and aiolimiter")
+        self.token = token
+        self._base = f"{RESOURCE_URI.rstrip('/')}/"
+        self._spaces_cache = {}
+        self._lists_cache = {}
+        # retry budget, see ClickupClient._get_response. No lock is needed within one event loop
+        self._retry_tokens = RETRY_TOKENS_CAP
+        # created lazily so that they are bound to the running event loop
+        self.session = None
+        self._sem = None
+        self._limiter = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                headers={"Authorization": self.token},
+                connector=aiohttp.TCPConnector(limit=ASYNC_CONNECTIONS),
+            )
+            self._sem = asyncio.Semaphore(ASYNC_CONCURRENCY)
+            self._limiter = AsyncLimiter(RATE_LIMIT, 60)
+        return self.session
+
+    async def _get_wrapper(self, url: str, params: list = None) -> dict:
+        """Wrapper for GET calls controlling for API rate limiting and concurrency.
+        429 and 5xx responses are retried the same way as in ClickupClient._get_response
+        Args:
+            url (str): url used for GET call
+            params (list, optional): query parameters as (key, value) pairs. Defaults to None.
+        Raises:
+            ValueError: raised if no response or error response are received
+        Returns:
+            dict: json response recieved from the server
+        """
+        session = self._get_session()
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            async with self._sem, self._limiter:
+                logger.debug("GET %s params=%s", url, params)
+                async with session.get(url, params=params) as resp:
+                    status = resp.status
+                    if status == 200:
+                        self._retry_tokens = min(
+                            RETRY_TOKENS_CAP, self._retry_tokens + RETRY_TOKENS_REFILL)
+                        if orjson is not None:
+                            return orjson.loads(await resp.read())
+                        return await resp.json()
+                    delay = ClickupClient._retry_delay(resp, attempt)
+            if status != 429 and status < 500:
+                break
+            if attempt == RETRY_ATTEMPTS:
+                break
+            if self._retry_tokens < 1:
+                break  # retry budget is exhausted, fail fast
+            self._retry_tokens -= 1
+            await asyncio.sleep(delay)
+        raise ValueError(f"Какие-то беды. Код ошибки: {status}")
+
+    _construct_endpoint = ClickupClient._construct_endpoint
+
+    async def get_user(self) -> dict:
+        """Same as ClickupClient.get_user"""
+        url = f"{self._base}user"
+        return (await self._get_wrapper(url))['user']
+
+    async def get_teams(self, id_only: bool = False) -> Union[str, List[dict]]:
+        """Same as ClickupClient.get_teams"""
+        url = f"{self._base}team"
+        res = await self._get_wrapper(url)
+        if id_only:
+            return res['teams'][0]['id']
+        else:
+            return res['teams']
+
+    async def get_spaces(self, team_id: str, archived: bool = False) -> list:
+        """Same as ClickupClient.get_spaces"""
+        url = f"{self._base}team/{team_id}/space?{str(archived).lower()}"
+        res = await self._get_wrapper(url)
+        return res['spaces']
+
+    async def get_space_by_name(self, team_id: str, name: str,
+                                archived: bool = False) -> dict:
+        """Same as ClickupClient.get_space_by_name"""
+        key = (team_id, archived)
+        if key not in self._spaces_cache:
+            self._spaces_cache[key] = ClickupClient._name_index(
+                await self.get_spaces(team_id, archived))
+        return ClickupClient._find_by_name(
+            self._spaces_cache[key], name, "К сожалению, спейса с таким именем не нашлось")
+
+    async def get_lists(self, space_id: str, archived: bool = False) -> list:
+        """Same as ClickupClient.get_lists"""
+        url = f"{self._base}space/{space_id}/list?{str(archived).lower()}"
+        res = await self._get_wrapper(url)
+        return res['lists']
+
+    async def get_list_by_name_and_space_id(
+            self,
+            space_id: str,
+            archived: bool = False,
+            name: str = None) -> dict:
+        """Same as ClickupClient.get_list_by_name_and_space_id"""
+        key = (space_id, archived)
+        if key not in self._lists_cache:
+            self._lists_cache[key] = ClickupClient._name_index(
+                await self.get_lists(space_id, archived))
+        return ClickupClient._find_by_name(
+            self._lists_cache[key], name, "К сожалению, листа с таким именем не нашлось")
+
+    async def get_tasks_100(self, team_id: str, page: int = None, **kwargs) -> dict:
+        """Same as ClickupClient.get_tasks_100 except for the fields argument.
+        Accepts the same filtering arguments as ClickupClient.get_tasks_100
+        """
+        if 'fields' in kwargs:
+            raise TypeError("AsyncClickupClient.get_tasks_100() does not support the fields argument, "
+                            "use ClickupClient.get_tasks_100 instead")
+        params = ClickupClient._task_query_params(team_id=team_id, **kwargs)
+        if page is not None:
+            params.append(("page", page))
+        url = f"{self._base}team/{team_id}/task"
+        return await self._get_wrapper(url, params)
+
+    async def get_all_tasks(self, page_limit=-1, **kwargs) -> List[dict]:
+        """Same as ClickupClient.get_all_tasks"""
+        # query parameters are the same for every page except the page number
+        params = ClickupClient._task_query_params(**kwargs)
+        url = f"{self._base}team/{kwargs['team_id']}/task"
+        tasks = []
+        for pages in ClickupClient._page_batches(page_limit):
+            pages_pending = [
+                asyncio.ensure_future(self._get_wrapper(url, params + [("page", page)]))
+                for page in pages]
+
+            def cancel_on_failure(done):
+                # only the pages after the failed one are cancelled, so that
+                # the pages awaited before it still complete and the error is raised in order
+                if not done.cancelled() and done.exception() is not None:
+                    for page_pending in pages_pending[pages_pending.index(done) + 1:]:
+                        page_pending.cancel()
+
+            for page_pending in pages_pending:
+                page_pending.add_done_callback(cancel_on_failure)
+            last_page_found = False
+            try:
+                # pages are consumed in order so that the ones after the last page can be cancelled
+                for page_pending in pages_pending:
+                    if ClickupClient._add_page(tasks, await page_pending):
+                        last_page_found = True
+                        break
+            finally:
+                # once the last page is found or a request failed
+                # the pages which are still pending are not needed
+                for page_pending in pages_pending:
+                    page_pending.cancel()
+                await asyncio.gather(*pages_pending, return_exceptions=True)
+            if last_page_found:
+                break
+        return tasks
+
+    async def get_task(self, task_id: str) -> dict:
+        """Same as ClickupClient.get_task"""
+        url = f"{self._base}task/{task_id}"
+        return await self._get_wrapper(url)
+
+    async def get_custom_fields(self, list_id: str) -> dict:
+        """Same as ClickupClient.get_custom_fields"""
+        url = f"{self._base}list/{list_id}/field"
+        return await self._get_wrapper(url)
+
+    async def get_time_in_status(self, task_ids: List[str]) -> dict:
+        """Same as ClickupClient.get_time_in_status"""
+        urls = ClickupClient._time_in_status_urls(self._base, task_ids)
+        return list(await asyncio.gather(*(self._get_wrapper(url) for url in urls)))
+
+    async def get_tags(self, space_id: str) -> dict:
+        """Same as ClickupClient.get_tags"""
+        url = f"{self._base}space/{space_id}/tag"
+        return await self._get_wrapper(url)